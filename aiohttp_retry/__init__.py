@@ -1,2 +1,3 @@
+from .circuit_breaker import *  # noqa: F403
 from .client import *  # noqa: F403
 from .retry_options import *  # noqa: F403
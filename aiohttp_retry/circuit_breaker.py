@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+
+class CircuitOpenError(Exception):
+    """Request was not sent, because circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Fail fast when server keeps failing, instead of waiting for all retries of every request.
+
+    After ``failure_threshold`` failed requests in a row the circuit opens and requests raise
+    ``CircuitOpenError`` without being sent. After ``recovery_timeout`` seconds one request is let through:
+    if it succeeds the circuit closes, otherwise it opens again.
+    """
+
+    __slots__ = ("_clock", "_failures", "_opened_at", "failure_threshold", "recovery_timeout")
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,  # How many failed requests in a row open the circuit
+        recovery_timeout: float = 30.0,  # How long circuit stays open before a probe request
+        clock: Callable[[], float] = time.monotonic,  # Source of time, in seconds
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_request(self) -> None:
+        if self._opened_at is None:
+            return
+
+        now = self._clock()
+        if now - self._opened_at < self.recovery_timeout:
+            msg = "circuit breaker is open, request was not sent"
+            raise CircuitOpenError(msg)
+
+        # half-open: let this request check if server is back, others wait for one more recovery_timeout
+        self._opened_at = now
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
@@ -5,6 +5,8 @@ import logging
 import sys
 from abc import abstractmethod
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -16,10 +18,12 @@ from typing import (
     Union,
 )
 
-from aiohttp import ClientResponse, ClientSession, hdrs
+from aiohttp import ClientResponse, ClientResponseError, ClientSession, hdrs
 from aiohttp.typedefs import StrOrURL
 from yarl import URL as YARL_URL
 
+# imported at runtime, not only for type checking, so typing.get_type_hints works on RetryClient
+from .circuit_breaker import CircuitBreaker  # noqa: TCH001
 from .retry_options import ExponentialRetry, RetryOptionsBase
 
 _MIN_SERVER_ERROR_STATUS = 500
@@ -33,6 +37,7 @@ else:
     from typing_extensions import Protocol
 
 
+# defined at runtime for typing.get_type_hints too
 class _Logger(Protocol):
     """_Logger defines which methods logger object should have."""
 
@@ -56,8 +61,11 @@ _LoggerType = Union[_Logger, logging.Logger]
 
 RequestFunc = Callable[..., Awaitable[ClientResponse]]
 
+# dataclass got slots in python 3.10
+_DATACLASS_SLOTS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class RequestParams:
     method: str
     url: _RAW_URL_TYPE
@@ -67,6 +75,16 @@ class RequestParams:
 
 
 class _RequestContext:
+    __slots__ = (
+        "_circuit_breaker",
+        "_logger",
+        "_params_list",
+        "_raise_for_status",
+        "_request_func",
+        "_response",
+        "_retry_options",
+    )
+
     def __init__(
         self,
         request_func: RequestFunc,
@@ -74,6 +92,7 @@ class _RequestContext:
         logger: _LoggerType,
         retry_options: RetryOptionsBase,
         raise_for_status: bool = False,
+        circuit_breaker: CircuitBreaker | None = None,
     ) -> None:
         assert len(params_list) > 0  # noqa: S101
 
@@ -82,77 +101,126 @@ class _RequestContext:
         self._logger = logger
         self._retry_options = retry_options
         self._raise_for_status = raise_for_status
+        self._circuit_breaker = circuit_breaker
 
         self._response: ClientResponse | None = None
 
-    async def _is_skip_retry(self, current_attempt: int, response: ClientResponse) -> bool:
-        if current_attempt == self._retry_options.attempts:
+    def _is_retry_status(self, status: int) -> bool:
+        if status >= _MIN_SERVER_ERROR_STATUS and self._retry_options.retry_all_server_errors:
+            return True
+
+        return status in self._retry_options.statuses
+
+    def _is_skip_retry(self, current_attempt: int, attempts: int, response: ClientResponse) -> bool | None:
+        """Return None if status alone doesn't decide, then evaluate_response_callback does."""
+        if current_attempt >= attempts:
             return True
 
         if response.method.upper() not in self._retry_options.methods:
             return True
 
-        if response.status >= _MIN_SERVER_ERROR_STATUS and self._retry_options.retry_all_server_errors:
+        if self._is_retry_status(response.status):
             return False
 
-        if response.status in self._retry_options.statuses:
-            return False
+        return None
 
-        if self._retry_options.evaluate_response_callback is None:
-            return True
+    def _get_retry_wait(self, current_attempt: int, response: ClientResponse | None) -> float:
+        retry_wait = self._retry_options.get_timeout(attempt=current_attempt, response=response)
+
+        max_retry_after = self._retry_options.max_retry_after
+        if response is None or max_retry_after is None:
+            return retry_wait
 
-        return await self._retry_options.evaluate_response_callback(response)
+        retry_after = _parse_retry_after(response.headers.get(hdrs.RETRY_AFTER))
+        if retry_after is None:
+            return retry_wait
+
+        # server knows better when to come back, but never wait less than usual
+        return max(retry_wait, min(retry_after, max_retry_after))
+
+    def _record_result(self, failed: bool) -> None:
+        if self._circuit_breaker is None:
+            return
+
+        if failed:
+            self._circuit_breaker.record_failure()
+        else:
+            self._circuit_breaker.record_success()
+
+    def _record_exception(self, e: Exception) -> None:
+        """Record a request that raised, only errors caused by the server count as failures."""
+        if isinstance(e, ClientResponseError):
+            # raised for status, so it is judged by status like a returned response
+            self._record_result(failed=self._is_retry_status(e.status))
+        elif isinstance(e, self._retry_options.exceptions):
+            # retried exception that ran out of attempts
+            self._record_result(failed=True)
+        # other exceptions, e.g. a bad url or a bug in evaluate_response_callback, say nothing about the server
 
     async def _do_request(self) -> ClientResponse:
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.before_request()
+
+        # read once per request instead of on every attempt, helpers get attempts from here as well
+        retry_options = self._retry_options
+        attempts = retry_options.attempts
+        params_list = self._params_list
+        request_func = self._request_func
+
         current_attempt = 0
 
         while True:
-            self._logger.debug(f"Attempt {current_attempt+1} out of {self._retry_options.attempts}")
-
             current_attempt += 1
+            self._logger.debug("Attempt %d out of %d", current_attempt, attempts)
+
             try:
-                try:
-                    params = self._params_list[current_attempt - 1]
-                except IndexError:
-                    params = self._params_list[-1]
+                # the last params are reused when there are fewer of them than attempts
+                params = params_list[min(current_attempt, len(params_list)) - 1]
 
-                response: ClientResponse = await self._request_func(
+                # a new dict for every attempt: trace hooks get it by reference and may keep it
+                trace_request_ctx: dict[str, Any] = {"current_attempt": current_attempt}
+                if params.trace_request_ctx:
+                    trace_request_ctx.update(params.trace_request_ctx)
+
+                response: ClientResponse = await request_func(
                     params.method,
                     params.url,
                     headers=params.headers,
-                    trace_request_ctx={
-                        "current_attempt": current_attempt,
-                        **(params.trace_request_ctx or {}),
-                    },
+                    trace_request_ctx=trace_request_ctx,
                     **(params.kwargs or {}),
                 )
 
-                debug_message = f"Retrying after response code: {response.status}"
-                skip_retry = await self._is_skip_retry(current_attempt, response)
+                skip_retry = self._is_skip_retry(current_attempt, attempts, response)
+                if skip_retry is None:
+                    # only await when there is a callback, most clients don't have one
+                    evaluate_response_callback = retry_options.evaluate_response_callback
+                    skip_retry = evaluate_response_callback is None or await evaluate_response_callback(response)
 
                 if skip_retry:
                     if self._raise_for_status:
                         response.raise_for_status()
+                    # request that ran out of attempts on retried status is a failure too
+                    self._record_result(failed=self._is_retry_status(response.status))
                     self._response = response
                     return self._response
-                retry_wait = self._retry_options.get_timeout(attempt=current_attempt, response=response)
+                retry_wait = self._get_retry_wait(current_attempt, response)
+                # return connection to the pool, so it is not held during the sleep
+                response.release()
+                self._logger.debug("Retrying after response code: %d", response.status)
 
             except Exception as e:
-                if current_attempt >= self._retry_options.attempts:
-                    raise
-
-                is_exc_valid = any(isinstance(e, exc) for exc in self._retry_options.exceptions)
-                if not is_exc_valid:
+                if current_attempt >= attempts or not isinstance(e, retry_options.exceptions):
+                    self._record_exception(e)
                     raise
 
-                debug_message = f"Retrying after exception: {e!r}"
-                retry_wait = self._retry_options.get_timeout(attempt=current_attempt, response=None)
+                retry_wait = self._get_retry_wait(current_attempt, None)
+                self._logger.debug("Retrying after exception: %r", e)
 
-            self._logger.debug(debug_message)
-            await asyncio.sleep(retry_wait)
+            if retry_wait > 0:
+                await asyncio.sleep(retry_wait)
 
     def __await__(self) -> Generator[Any, None, ClientResponse]:
-        return self.__aenter__().__await__()
+        return self._do_request().__await__()
 
     async def __aenter__(self) -> ClientResponse:
         return await self._do_request()
@@ -167,6 +235,25 @@ class _RequestContext:
             self._response.close()
 
 
+def _parse_retry_after(value: str | None) -> float | None:
+    """Return seconds to wait from Retry-After header, which holds either seconds or HTTP date."""
+    if value is None:
+        return None
+
+    value = value.strip()
+    if value.isascii() and value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
 def _url_to_urls(url: _URL_TYPE) -> tuple[StrOrURL, ...]:
     if isinstance(url, (str, YARL_URL)):
         return (url,)
@@ -194,26 +281,33 @@ class RetryClient:
         retry_options: RetryOptionsBase | None = None,
         raise_for_status: bool = False,
         *args: Any,
+        circuit_breaker: CircuitBreaker | None = None,
         **kwargs: Any,
     ) -> None:
-        if client_session is not None:
-            client = client_session
-            closed = None
-        else:
-            client = ClientSession(*args, **kwargs)
-            closed = False
-
-        self._client = client
-        self._closed = closed
+        self._client = client_session if client_session is not None else ClientSession(*args, **kwargs)
+        # a session passed from outside is closed by its owner
+        self._owns_session = client_session is None
 
         self._logger: _LoggerType = logger or logging.getLogger("aiohttp_retry")
         self._retry_options: RetryOptionsBase = retry_options or ExponentialRetry()
         self._raise_for_status = raise_for_status
+        self._circuit_breaker = circuit_breaker
 
     @property
     def retry_options(self) -> RetryOptionsBase:
         return self._retry_options
 
+    @property
+    def _client(self) -> ClientSession:
+        return self._session
+
+    @_client.setter
+    def _client(self, client_session: ClientSession) -> None:
+        self._session = client_session
+        # bound once per session instead of creating a new bound method for every request,
+        # rebound here so requests go to the new session if _client is reassigned
+        self._request_func: RequestFunc = client_session.request
+
     def requests(
         self,
         params_list: list[RequestParams],
@@ -348,8 +442,8 @@ class RetryClient:
         )
 
     async def close(self) -> None:
-        await self._client.close()
-        self._closed = True
+        if self._owns_session:
+            await self._client.close()
 
     def _make_request(
         self,
@@ -360,12 +454,15 @@ class RetryClient:
         **kwargs: Any,
     ) -> _RequestContext:
         url_list = _url_to_urls(url)
+        # popped once, so every url gets them, not only the first one
+        headers = kwargs.pop("headers", None)
+        trace_request_ctx = kwargs.pop("trace_request_ctx", None)
         params_list = [
             RequestParams(
                 method=method,
                 url=url,
-                headers=kwargs.pop("headers", {}),
-                trace_request_ctx=kwargs.pop("trace_request_ctx", None),
+                headers=headers,
+                trace_request_ctx=trace_request_ctx,
                 kwargs=kwargs,
             )
             for url in url_list
@@ -388,11 +485,12 @@ class RetryClient:
         if raise_for_status is None:
             raise_for_status = self._raise_for_status
         return _RequestContext(
-            request_func=self._client.request,
+            request_func=self._request_func,
             params_list=params_list,
             logger=self._logger,
             retry_options=retry_options,
             raise_for_status=raise_for_status,
+            circuit_breaker=self._circuit_breaker,
         )
 
     async def __aenter__(self) -> RetryClient:  # noqa: PYI034
@@ -407,9 +505,9 @@ class RetryClient:
         await self.close()
 
     def __del__(self) -> None:
-        if getattr(self, "_closed", None) is None:
-            # in case object was not initialized (__init__ raised an exception)
+        if not getattr(self, "_owns_session", False):
+            # session was passed from outside or object was not initialized (__init__ raised an exception)
             return
 
-        if not self._closed:
+        if not self._client.closed:
             self._logger.warning("Aiohttp retry client was not closed")
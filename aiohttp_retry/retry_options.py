@@ -1,16 +1,84 @@
 from __future__ import annotations
 
 import abc
+import math
 import random
-from typing import Any, Awaitable, Callable, Iterable
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Iterable, Sequence
 from warnings import warn
 
 from aiohttp import ClientResponse
 
 EvaluateResponseCallbackType = Callable[[ClientResponse], Awaitable[bool]]
 
+_MAX_TIMEOUTS_TABLE_SIZE = 64
+
+_DEFAULT_METHODS = frozenset({"HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE", "POST", "CONNECT", "PATCH"})
+
+
+@lru_cache(maxsize=128)
+def _exponential_max_attempt(start_timeout: float, max_timeout: float, factor: float) -> float:
+    """Return attempt from which timeout is max_timeout for sure, inf if timeouts never grow up to it."""
+    if start_timeout <= 0 or factor <= 1 or math.isinf(max_timeout):
+        return math.inf
+    if start_timeout >= max_timeout:
+        return 0
+    # difference of logs instead of log of the ratio, as the ratio overflows for a tiny start_timeout;
+    # one more attempt covers float error of log, timeouts up to it are computed and clamped as usual
+    return math.ceil((math.log(max_timeout) - math.log(start_timeout)) / math.log(factor)) + 1
+
+
+def _exponential_timeout(attempt: int, start_timeout: float, max_timeout: float, factor: float) -> float:
+    if start_timeout <= 0:
+        # no backoff at all, the power would be multiplied by zero anyway but may overflow first
+        return 0.0
+    if attempt >= _exponential_max_attempt(start_timeout, max_timeout, factor):
+        # the power is far past max_timeout and may not even fit in a float
+        return max_timeout
+    if factor == 2:  # noqa: PLR2004
+        # default factor, exact and cheaper than pow
+        return min(math.ldexp(start_timeout, attempt), max_timeout)
+    return min(start_timeout * (factor**attempt), max_timeout)
+
+
+@lru_cache(maxsize=128)
+def _exponential_timeouts(attempts: int, start_timeout: float, max_timeout: float, factor: float) -> tuple[float, ...]:
+    # cached, so options created per request with the same params share one table;
+    # it ends where timeouts reach max_timeout or at a size limit, so a cached table stays small
+    # even for "retry forever" attempts, later attempts get their timeout from _exponential_timeout
+    last_attempt = int(
+        min(attempts, _MAX_TIMEOUTS_TABLE_SIZE - 1, _exponential_max_attempt(start_timeout, max_timeout, factor))
+    )
+    return tuple(
+        _exponential_timeout(attempt, start_timeout, max_timeout, factor) for attempt in range(last_attempt + 1)
+    )
+
+
+def _fibonacci_timeouts(attempts: int, multiplier: float, max_timeout: float) -> tuple[float, ...]:
+    # timeouts for attempts 0..attempts are multiplier * 1, 2, 3, 5, ..., so the first retry waits multiplier * 2;
+    # the table ends where timeouts reach max_timeout, all later attempts wait max_timeout
+    timeouts = []
+    prev_step, current_step = 1.0, 1.0
+    for _ in range(attempts + 1):
+        timeout = min(multiplier * current_step, max_timeout)
+        timeouts.append(timeout)
+        if timeout >= max_timeout:
+            break
+        prev_step, current_step = current_step, prev_step + current_step
+    return tuple(timeouts)
+
 
 class RetryOptionsBase:
+    __slots__ = (
+        "attempts",
+        "evaluate_response_callback",
+        "exceptions",
+        "max_retry_after",
+        "methods",
+        "retry_all_server_errors",
+        "statuses",
+    )
+
     def __init__(
         self,
         attempts: int = 3,  # How many times we should retry
@@ -20,22 +88,26 @@ class RetryOptionsBase:
         retry_all_server_errors: bool = True,  # If should retry all 500 errors or not
         # a callback that will run on response to decide if retry
         evaluate_response_callback: EvaluateResponseCallbackType | None = None,
+        # Honor Retry-After response header, but wait no longer than that; None to ignore the header
+        max_retry_after: float | None = None,
     ) -> None:
         self.attempts: int = attempts
         if statuses is None:
             statuses = set()
-        self.statuses: Iterable[int] = statuses
+        self.statuses: frozenset[int] = frozenset(statuses)
 
         if exceptions is None:
             exceptions = set()
-        self.exceptions: Iterable[type[Exception]] = exceptions
+        # tuple, so it can be passed to isinstance as is
+        self.exceptions: tuple[type[Exception], ...] = tuple(exceptions)
 
-        if methods is None:
-            methods = {"HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE", "POST", "CONNECT", "PATCH"}
-        self.methods: Iterable[str] = {method.upper() for method in methods}
+        self.methods: frozenset[str] = (
+            _DEFAULT_METHODS if methods is None else frozenset(method.upper() for method in methods)
+        )
 
         self.retry_all_server_errors = retry_all_server_errors
         self.evaluate_response_callback = evaluate_response_callback
+        self.max_retry_after = max_retry_after
 
     @abc.abstractmethod
     def get_timeout(self, attempt: int, response: ClientResponse | None = None) -> float:
@@ -43,17 +115,22 @@ class RetryOptionsBase:
 
 
 class ExponentialRetry(RetryOptionsBase):
+    __slots__ = ("_factor", "_full_jitter", "_max_timeout", "_random", "_start_timeout", "_timeouts")
+
     def __init__(
         self,
         attempts: int = 3,  # How many times we should retry
         start_timeout: float = 0.1,  # Base timeout time, then it exponentially grow
         max_timeout: float = 30.0,  # Max possible timeout between tries
         factor: float = 2.0,  # How much we increase timeout each time
-        statuses: set[int] | None = None,  # On which statuses we should retry
-        exceptions: set[type[Exception]] | None = None,  # On which exceptions we should retry
-        methods: set[str] | None = None,  # On which HTTP methods we should retry
+        statuses: Iterable[int] | None = None,  # On which statuses we should retry
+        exceptions: Iterable[type[Exception]] | None = None,  # On which exceptions we should retry
+        methods: Iterable[str] | None = None,  # On which HTTP methods we should retry
         retry_all_server_errors: bool = True,
         evaluate_response_callback: EvaluateResponseCallbackType | None = None,
+        full_jitter: bool = False,  # Pick a random timeout between 0 and the exponential one
+        random_func: Callable[[], float] = random.random,  # Random number generator for full jitter
+        max_retry_after: float | None = None,
     ) -> None:
         super().__init__(
             attempts=attempts,
@@ -62,11 +139,18 @@ class ExponentialRetry(RetryOptionsBase):
             methods=methods,
             retry_all_server_errors=retry_all_server_errors,
             evaluate_response_callback=evaluate_response_callback,
+            max_retry_after=max_retry_after,
         )
 
         self._start_timeout: float = start_timeout
         self._max_timeout: float = max_timeout
         self._factor: float = factor
+        self._full_jitter = full_jitter
+        self._random = random_func
+
+        # the table may be shorter than attempts, or attempts may be changed later,
+        # so there is a fallback in get_timeout for attempts out of the table
+        self._timeouts = _exponential_timeouts(attempts, start_timeout, max_timeout, factor)
 
     def get_timeout(
         self,
@@ -74,16 +158,24 @@ class ExponentialRetry(RetryOptionsBase):
         response: ClientResponse | None = None,  # noqa: ARG002
     ) -> float:
         """Return timeout with exponential backoff."""
-        timeout = self._start_timeout * (self._factor**attempt)
-        return min(timeout, self._max_timeout)
+        if 0 <= attempt < len(self._timeouts):
+            timeout = self._timeouts[attempt]
+        else:
+            timeout = _exponential_timeout(attempt, self._start_timeout, self._max_timeout, self._factor)
+        if self._full_jitter:
+            return self._random() * timeout
+        return timeout
 
 
 def RetryOptions(*args: Any, **kwargs: Any) -> ExponentialRetry:  # noqa: N802
-    warn("RetryOptions is deprecated, use ExponentialRetry", stacklevel=1)
+    # default warning filters show it once per caller's line, not on every request
+    warn("RetryOptions is deprecated, use ExponentialRetry", DeprecationWarning, stacklevel=2)
     return ExponentialRetry(*args, **kwargs)
 
 
 class RandomRetry(RetryOptionsBase):
+    __slots__ = ("max_timeout", "min_timeout", "random")
+
     def __init__(
         self,
         attempts: int = 3,  # How many times we should retry
@@ -95,6 +187,7 @@ class RandomRetry(RetryOptionsBase):
         random_func: Callable[[], float] = random.random,  # Random number generator
         retry_all_server_errors: bool = True,
         evaluate_response_callback: EvaluateResponseCallbackType | None = None,
+        max_retry_after: float | None = None,
     ) -> None:
         super().__init__(
             attempts=attempts,
@@ -103,6 +196,7 @@ class RandomRetry(RetryOptionsBase):
             methods=methods,
             retry_all_server_errors=retry_all_server_errors,
             evaluate_response_callback=evaluate_response_callback,
+            max_retry_after=max_retry_after,
         )
 
         self.attempts: int = attempts
@@ -120,14 +214,17 @@ class RandomRetry(RetryOptionsBase):
 
 
 class ListRetry(RetryOptionsBase):
+    __slots__ = ("timeouts",)
+
     def __init__(
         self,
-        timeouts: list[float],
+        timeouts: Sequence[float],
         statuses: Iterable[int] | None = None,  # On which statuses we should retry
         exceptions: Iterable[type[Exception]] | None = None,  # On which exceptions we should retry
         methods: Iterable[str] | None = None,  # On which HTTP methods we should retry
         retry_all_server_errors: bool = True,
         evaluate_response_callback: EvaluateResponseCallbackType | None = None,
+        max_retry_after: float | None = None,
     ) -> None:
         super().__init__(
             attempts=len(timeouts),
@@ -136,19 +233,25 @@ class ListRetry(RetryOptionsBase):
             methods=methods,
             retry_all_server_errors=retry_all_server_errors,
             evaluate_response_callback=evaluate_response_callback,
+            max_retry_after=max_retry_after,
         )
-        self.timeouts = timeouts
+        # a copy, so changes of the passed list don't affect requests in flight
+        self.timeouts: tuple[float, ...] = tuple(timeouts)
 
     def get_timeout(
         self,
         attempt: int,
         response: ClientResponse | None = None,  # noqa: ARG002
     ) -> float:
-        """Timeouts from a defined list."""
+        """Timeouts from a defined list, the last one is repeated if attempts was raised afterwards."""
+        if attempt >= len(self.timeouts):
+            return self.timeouts[-1]
         return self.timeouts[attempt]
 
 
 class FibonacciRetry(RetryOptionsBase):
+    __slots__ = ("_max_timeout", "_multiplier", "_timeouts")
+
     def __init__(
         self,
         attempts: int = 3,
@@ -159,6 +262,7 @@ class FibonacciRetry(RetryOptionsBase):
         max_timeout: float = 3.0,  # Maximum possible timeout between tries
         retry_all_server_errors: bool = True,
         evaluate_response_callback: EvaluateResponseCallbackType | None = None,
+        max_retry_after: float | None = None,
     ) -> None:
         super().__init__(
             attempts=attempts,
@@ -167,40 +271,63 @@ class FibonacciRetry(RetryOptionsBase):
             methods=methods,
             retry_all_server_errors=retry_all_server_errors,
             evaluate_response_callback=evaluate_response_callback,
+            max_retry_after=max_retry_after,
         )
 
-        self.max_timeout = max_timeout
-        self.multiplier = multiplier
-        self.prev_step = 1.0
-        self.current_step = 1.0
+        self._max_timeout = max_timeout
+        self._multiplier = multiplier
+
+        # timeout depends only on attempt, so one instance can be shared by concurrent requests
+        self._timeouts = _fibonacci_timeouts(attempts, multiplier, max_timeout)
+
+    @property
+    def max_timeout(self) -> float:
+        return self._max_timeout
+
+    @max_timeout.setter
+    def max_timeout(self, max_timeout: float) -> None:
+        self._max_timeout = max_timeout
+        self._timeouts = _fibonacci_timeouts(self.attempts, self._multiplier, max_timeout)
+
+    @property
+    def multiplier(self) -> float:
+        return self._multiplier
+
+    @multiplier.setter
+    def multiplier(self, multiplier: float) -> None:
+        self._multiplier = multiplier
+        self._timeouts = _fibonacci_timeouts(self.attempts, multiplier, self._max_timeout)
 
     def get_timeout(
         self,
-        attempt: int,  # noqa: ARG002
+        attempt: int,
         response: ClientResponse | None = None,  # noqa: ARG002
     ) -> float:
-        new_current_step = self.prev_step + self.current_step
-        self.prev_step = self.current_step
-        self.current_step = new_current_step
-
-        return min(self.multiplier * new_current_step, self.max_timeout)
+        if attempt >= len(self._timeouts):
+            # the table ended at max_timeout, or attempts was raised after it was built
+            return _fibonacci_timeouts(attempt, self._multiplier, self._max_timeout)[-1]
+        return self._timeouts[attempt]
 
 
 class JitterRetry(ExponentialRetry):
     """https://github.com/inyutin/aiohttp_retry/issues/44."""
 
+    __slots__ = ("_jitter_scale", "_random_interval_size")
+
     def __init__(
         self,
         attempts: int = 3,  # How many times we should retry
         start_timeout: float = 0.1,  # Base timeout time, then it exponentially grow
         max_timeout: float = 30.0,  # Max possible timeout between tries
         factor: float = 2.0,  # How much we increase timeout each time
-        statuses: set[int] | None = None,  # On which statuses we should retry
-        exceptions: set[type[Exception]] | None = None,  # On which exceptions we should retry
-        methods: set[str] | None = None,  # On which HTTP methods we should retry
+        statuses: Iterable[int] | None = None,  # On which statuses we should retry
+        exceptions: Iterable[type[Exception]] | None = None,  # On which exceptions we should retry
+        methods: Iterable[str] | None = None,  # On which HTTP methods we should retry
         random_interval_size: float = 2.0,  # size of interval for random component
         retry_all_server_errors: bool = True,
         evaluate_response_callback: EvaluateResponseCallbackType | None = None,
+        random_func: Callable[[], float] = random.random,  # Random number generator for the random component
+        max_retry_after: float | None = None,
     ) -> None:
         super().__init__(
             attempts=attempts,
@@ -212,17 +339,18 @@ class JitterRetry(ExponentialRetry):
             methods=methods,
             retry_all_server_errors=retry_all_server_errors,
             evaluate_response_callback=evaluate_response_callback,
+            random_func=random_func,
+            max_retry_after=max_retry_after,
         )
 
-        self._start_timeout: float = start_timeout
-        self._max_timeout: float = max_timeout
-        self._factor: float = factor
         self._random_interval_size = random_interval_size
+        # jitter is uniform(0, size) to the power of factor, which is this constant times random() to that power
+        self._jitter_scale = random_interval_size**factor
 
     def get_timeout(
         self,
         attempt: int,
         response: ClientResponse | None = None,  # noqa: ARG002
     ) -> float:
-        timeout: float = super().get_timeout(attempt) + random.uniform(0, self._random_interval_size) ** self._factor
+        timeout: float = super().get_timeout(attempt) + self._jitter_scale * self._random() ** self._factor
         return timeout
@@ -13,6 +13,7 @@ class App:
         app.router.add_get("/sometimes_json", self.sometimes_json)
         app.router.add_get("/check_headers", self.check_headers)
         app.router.add_get("/with_auth", self.with_auth)
+        app.router.add_get("/retry_after", self.retry_after)
 
         app.router.add_options("/options_handler", self.ping_handler)
         app.router.add_head("/head_handler", self.ping_handler)
@@ -64,6 +65,13 @@ class App:
             return web.Response(text="incorrect auth", status=403)
         return web.Response(text="Ok!", status=200)
 
+    async def retry_after(self, _: web.Request) -> web.Response:
+        self.counter += 1
+        if self.counter == 1:
+            return web.Response(text="Slow down", status=429, headers={"Retry-After": "5"})
+
+        return web.Response(text="Ok!", status=200)
+
     @property
     def web_app(self) -> web.Application:
         return self._web_app
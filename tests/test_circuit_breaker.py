@@ -0,0 +1,48 @@
+import pytest
+
+from aiohttp_retry import CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_opens_after_failures_in_a_row() -> None:
+    breaker = CircuitBreaker(failure_threshold=3, clock=Clock())
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.before_request()  # still closed
+
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_circuit_probe_after_recovery_timeout() -> None:
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    breaker.before_request()  # probe is let through
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # others wait for the probe
+
+    breaker.record_failure()
+    clock.now = 15
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.now = 20
+    breaker.before_request()
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.before_request()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 from types import SimpleNamespace
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Optional, get_type_hints
 
 import pytest
 from aiohttp import (
@@ -15,16 +17,31 @@ from aiohttp import (
 )
 from yarl import URL
 
-from aiohttp_retry import ExponentialRetry, ListRetry, RetryClient
-from aiohttp_retry.client import RequestParams
+from aiohttp_retry import CircuitBreaker, CircuitOpenError, ExponentialRetry, ListRetry, RetryClient
+from aiohttp_retry.client import RequestParams, _parse_retry_after
 from tests.app import App
 
 if TYPE_CHECKING:
     import pytest_aiohttp.plugin
 
+    from aiohttp_retry.client import _RequestContext
     from aiohttp_retry.retry_options import RetryOptionsBase
 
 
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Record delays passed to asyncio.sleep instead of waiting."""
+    delays: list[float] = []
+    original_sleep = asyncio.sleep
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+        await original_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return delays
+
+
 async def get_retry_client_and_test_app_for_test(
     aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
     raise_for_status: bool = False,
@@ -38,21 +55,23 @@ async def get_retry_client_and_test_app_for_test(
     return retry_client, test_app
 
 
-async def test_hello(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
-    async with retry_client.get("/ping") as response:
-        text = await response.text()
-        assert response.status == 200
-        assert text == "Ok!"
-
-        assert test_app.counter == 1
-
-    await retry_client.close()
-
-
-async def test_hello_by_request(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
+@pytest.mark.parametrize(
+    "make_request",
+    [
+        lambda retry_client: retry_client.get("/ping"),
+        lambda retry_client: retry_client.request(method=hdrs.METH_GET, url="/ping"),
+        lambda retry_client: retry_client.request(hdrs.METH_GET, "/ping"),
+        # https://github.com/inyutin/aiohttp_retry/issues/41
+        lambda retry_client: retry_client.get(URL("/ping")),
+    ],
+    ids=["get", "request_by_keywords", "request", "yarl_url"],
+)
+async def test_hello(
+    aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
+    make_request: Callable[[RetryClient], _RequestContext],
+) -> None:
     retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
-    async with retry_client.request(method=hdrs.METH_GET, url="/ping") as response:
+    async with make_request(retry_client) as response:
         text = await response.text()
         assert response.status == 200
         assert text == "Ok!"
@@ -66,39 +85,53 @@ async def test_hello_with_context(aiohttp_client: pytest_aiohttp.plugin.AiohttpC
     test_app = App()
     app = test_app.web_app()
     client = await aiohttp_client(app)
-    async with RetryClient() as retry_client:
-        retry_client._client = client
-        async with retry_client.get("/ping") as response:
-            text = await response.text()
-            assert response.status == 200
-            assert text == "Ok!"
+    async with RetryClient(client_session=client) as retry_client, retry_client.get("/ping") as response:
+        text = await response.text()
+        assert response.status == 200
+        assert text == "Ok!"
 
-            assert test_app.counter == 1
+        assert test_app.counter == 1
 
 
-async def test_internal_error(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
-    retry_options = ExponentialRetry(attempts=5)
-    async with retry_client.get("/internal_error", retry_options) as response:
-        assert response.status == 500
-        assert test_app.counter == 5
+async def test_passed_client_session_is_not_closed() -> None:
+    client_session = ClientSession()
+    retry_client = RetryClient(client_session=client_session)
 
     await retry_client.close()
+    assert not client_session.closed
+
+    await client_session.close()
 
 
-async def test_not_found_error(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
+@pytest.mark.parametrize(
+    ("url", "retry_options", "expected_status", "expected_counter"),
+    [
+        ("/internal_error", ExponentialRetry(start_timeout=0, attempts=5), 500, 5),
+        ("/internal_error", ExponentialRetry(attempts=0), 500, 1),
+        ("/not_found_error", ExponentialRetry(start_timeout=0, attempts=5, statuses={404}), 404, 5),
+        ("/internal_error", ExponentialRetry(retry_all_server_errors=False), 500, 1),
+        ("/internal_error", ListRetry(timeouts=[0] * 3), 500, 3),
+    ],
+    ids=["internal_error", "zero_attempts", "not_found_error", "not_retry_server_errors", "list_retry"],
+)
+async def test_retries_stop_on_error(
+    aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
+    url: str,
+    retry_options: RetryOptionsBase,
+    expected_status: int,
+    expected_counter: int,
+) -> None:
     retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
-    retry_options = ExponentialRetry(attempts=5, statuses={404})
-    async with retry_client.get("/not_found_error", retry_options) as response:
-        assert response.status == 404
-        assert test_app.counter == 5
+    async with retry_client.get(url, retry_options) as response:
+        assert response.status == expected_status
+        assert test_app.counter == expected_counter
 
     await retry_client.close()
 
 
 async def test_sometimes_error(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
     retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
-    retry_options = ExponentialRetry(attempts=5)
+    retry_options = ExponentialRetry(start_timeout=0, attempts=5)
     async with retry_client.get("/sometimes_error", retry_options) as response:
         text = await response.text()
         assert response.status == 200
@@ -111,7 +144,7 @@ async def test_sometimes_error(aiohttp_client: pytest_aiohttp.plugin.AiohttpClie
 
 async def test_sometimes_error_with_raise_for_status(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
     retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client, raise_for_status=True)
-    retry_options = ExponentialRetry(attempts=5, exceptions={ClientResponseError})
+    retry_options = ExponentialRetry(start_timeout=0, attempts=5, exceptions={ClientResponseError})
     async with retry_client.get("/sometimes_error", retry_options) as response:
         text = await response.text()
         assert response.status == 200
@@ -127,7 +160,7 @@ async def test_override_options(aiohttp_client: pytest_aiohttp.plugin.AiohttpCli
         aiohttp_client,
         retry_options=ExponentialRetry(attempts=1),
     )
-    retry_options = ExponentialRetry(attempts=5)
+    retry_options = ExponentialRetry(start_timeout=0, attempts=5)
     async with retry_client.get("/sometimes_error", retry_options) as response:
         text = await response.text()
         assert response.status == 200
@@ -165,8 +198,8 @@ async def test_add_trace_request_ctx(aiohttp_client: pytest_aiohttp.plugin.Aioht
     trace_config = TraceConfig()
     trace_config.on_request_start.append(on_request_start)
 
-    retry_client = RetryClient()
-    retry_client._client = await aiohttp_client(test_app.web_app(), trace_configs=[trace_config])
+    client = await aiohttp_client(test_app.web_app(), trace_configs=[trace_config])
+    retry_client = RetryClient(client_session=client, retry_options=ExponentialRetry(start_timeout=0))
 
     async with retry_client.get("/sometimes_error", trace_request_ctx={"foo": "bar"}):
         assert test_app.counter == 3
@@ -183,12 +216,17 @@ async def test_add_trace_request_ctx(aiohttp_client: pytest_aiohttp.plugin.Aioht
 
 
 @pytest.mark.parametrize("attempts", [2, 3])
-async def test_change_urls_in_request(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient, attempts: int) -> None:
+@pytest.mark.parametrize("url_type", [list, tuple])
+async def test_change_urls_in_request(
+    aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
+    attempts: int,
+    url_type: type[list | tuple],
+) -> None:
     retry_client, test_app = await get_retry_client_and_test_app_for_test(
         aiohttp_client,
-        retry_options=ExponentialRetry(attempts=attempts),
+        retry_options=ExponentialRetry(start_timeout=0, attempts=attempts),
     )
-    async with retry_client.get(url=["/internal_error", "/ping"]) as response:
+    async with retry_client.get(url=url_type(["/internal_error", "/ping"])) as response:
         text = await response.text()
         assert response.status == 200
         assert text == "Ok!"
@@ -198,15 +236,15 @@ async def test_change_urls_in_request(aiohttp_client: pytest_aiohttp.plugin.Aioh
     await retry_client.close()
 
 
-@pytest.mark.parametrize("attempts", [2, 3])
-async def test_change_urls_as_tuple_in_request(
-    aiohttp_client: pytest_aiohttp.plugin.AiohttpClient, attempts: int
-) -> None:
+async def test_change_urls_keeps_headers(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
     retry_client, test_app = await get_retry_client_and_test_app_for_test(
         aiohttp_client,
-        retry_options=ExponentialRetry(attempts=attempts),
+        retry_options=ExponentialRetry(start_timeout=0),
     )
-    async with retry_client.get(url=("/internal_error", "/ping")) as response:
+    async with retry_client.get(
+        url=["/internal_error", "/check_headers"],
+        headers={"correct_headers": "True"},
+    ) as response:
         text = await response.text()
         assert response.status == 200
         assert text == "Ok!"
@@ -219,9 +257,9 @@ async def test_change_urls_as_tuple_in_request(
 @pytest.mark.parametrize("url", [{"/ping", "/internal_error"}, []])
 async def test_pass_bad_urls(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient, url: list | set) -> None:
     retry_client, _ = await get_retry_client_and_test_app_for_test(aiohttp_client)
+    # urls are validated when the request is created, before it is sent
     with pytest.raises(ValueError):
-        async with retry_client.get(url=url):
-            pass
+        retry_client.get(url=url)
 
     await retry_client.close()
 
@@ -249,60 +287,25 @@ async def test_methods(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient, url:
 async def test_not_found_error_with_retry_client_raise_for_status(
     aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
 ) -> None:
-    test_app = App()
-    app = test_app.web_app
-
-    client = await aiohttp_client(app)
-    retry_client = RetryClient(raise_for_status=True)
-    retry_client._client = client
+    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client, raise_for_status=True)
 
-    retry_options = ExponentialRetry(attempts=5, statuses={404})
+    retry_options = ExponentialRetry(start_timeout=0, attempts=5, statuses={404})
     override_response = retry_client.get("/not_found_error", retry_options, raise_for_status=False)
     assert not override_response._raise_for_status
     response = retry_client.get("/not_found_error", retry_options)
     assert response._raise_for_status
 
-    try:
+    with pytest.raises(ClientResponseError) as exc_info:
         async with response:
             pass
-    except ClientResponseError as exc:
-        assert exc.status == 404  # noqa: PT017
-        assert test_app.counter == 5
-    else:
-        msg = "Expected ClientResponseError not raised"
-        raise AssertionError(msg)
-
-    await retry_client.close()
-    await client.close()
-
-
-async def test_request(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
-    async with retry_client.request(hdrs.METH_GET, "/ping") as response:
-        text = await response.text()
-        assert response.status == 200
-        assert text == "Ok!"
-
-        assert test_app.counter == 1
-
-    await retry_client.close()
-
-
-async def test_url_as_yarl(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    """https://github.com/inyutin/aiohttp_retry/issues/41."""
-    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
-    async with retry_client.get(URL("/ping")) as response:
-        text = await response.text()
-        assert response.status == 200
-        assert text == "Ok!"
-
-        assert test_app.counter == 1
+    assert exc_info.value.status == 404
+    assert test_app.counter == 5
 
     await retry_client.close()
 
 
 async def test_change_client_retry_options(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    retry_options = ExponentialRetry(attempts=5)
+    retry_options = ExponentialRetry(start_timeout=0, attempts=5)
     retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client, retry_options=retry_options)
 
     # first time with 5 attempts is okay
@@ -325,45 +328,19 @@ async def test_change_client_retry_options(aiohttp_client: pytest_aiohttp.plugin
     await retry_client.close()
 
 
-async def test_not_retry_server_errors(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    retry_options = ExponentialRetry(retry_all_server_errors=False)
-    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
-    async with retry_client.get("/internal_error", retry_options) as response:
-        assert response.status == 500
-        assert test_app.counter == 1
-
-    await retry_client.close()
-
-
-async def test_list_retry_works_for_multiple_attempts(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    retry_options = ListRetry(timeouts=[0] * 3)
-    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
-
-    async with retry_client.get("/internal_error", retry_options) as response:
-        assert response.status == 500
-        assert test_app.counter == 3
-
-    await retry_client.close()
-
-
 async def test_dont_retry_if_not_in_retry_methods(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
     retry_client, test_app = await get_retry_client_and_test_app_for_test(
         aiohttp_client,
-        retry_options=ExponentialRetry(),  # try on all methods by default
+        retry_options=ExponentialRetry(start_timeout=0),  # try on all methods by default
     )
 
     async with retry_client.get("/internal_error") as response:
         assert response.status == 500
         assert test_app.counter == 3
 
-    await retry_client.close()
-
-    retry_client, test_app = await get_retry_client_and_test_app_for_test(
-        aiohttp_client,
-        retry_options=ExponentialRetry(methods={"POST"}),  # try on only POST method
-    )
-
-    async with retry_client.get("/internal_error") as response:
+    test_app.counter = 0
+    retry_options = ExponentialRetry(start_timeout=0, methods={"POST"})  # try on only POST method
+    async with retry_client.get("/internal_error", retry_options) as response:
         assert response.status == 500
         assert test_app.counter == 1
 
@@ -374,14 +351,16 @@ async def test_implicit_client(aiohttp_client: pytest_aiohttp.plugin.AiohttpClie
     # check that if client not passed that it created implicitly
     test_app = App()
 
+    client = await aiohttp_client(test_app.web_app())
+
     retry_client = RetryClient()
     assert retry_client._client is not None
 
-    retry_client._client = await aiohttp_client(test_app.web_app())
-    async with retry_client.get("/ping") as response:
+    async with retry_client.get(client.make_url("/ping")) as response:
         assert response.status == 200
 
     await retry_client.close()
+    assert retry_client._client.closed
 
 
 async def test_evaluate_response_callback(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
@@ -392,7 +371,7 @@ async def test_evaluate_response_callback(aiohttp_client: pytest_aiohttp.plugin.
             return False
         return True
 
-    retry_options = ExponentialRetry(attempts=5, evaluate_response_callback=evaluate_response)
+    retry_options = ExponentialRetry(start_timeout=0, attempts=5, evaluate_response_callback=evaluate_response)
     retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client, retry_options=retry_options)
 
     async with retry_client.get("/sometimes_json") as response:
@@ -403,8 +382,41 @@ async def test_evaluate_response_callback(aiohttp_client: pytest_aiohttp.plugin.
         assert test_app.counter == 3
 
 
+async def test_retried_response_is_released(
+    aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    released = []
+    original_release = ClientResponse.release
+
+    def release(response: ClientResponse) -> Any:
+        released.append(response)
+        return original_release(response)
+
+    monkeypatch.setattr(ClientResponse, "release", release)
+
+    responses = []
+
+    async def evaluate_response(response: ClientResponse) -> bool:
+        responses.append(response)
+        return len(responses) == 2
+
+    retry_options = ExponentialRetry(start_timeout=0, attempts=5, evaluate_response_callback=evaluate_response)
+    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client, retry_options=retry_options)
+
+    async with retry_client.get("/ping") as response:
+        assert response.status == 200
+        assert test_app.counter == 2
+        assert released == [responses[0]]
+
+    await retry_client.close()
+
+
 async def test_multiply_urls_by_requests(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
+    retry_client, test_app = await get_retry_client_and_test_app_for_test(
+        aiohttp_client,
+        retry_options=ExponentialRetry(start_timeout=0),
+    )
     async with retry_client.requests(
         params_list=[
             RequestParams(
@@ -427,7 +439,7 @@ async def test_multiply_urls_by_requests(aiohttp_client: pytest_aiohttp.plugin.A
 
 
 async def test_multiply_methods_by_requests(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    retry_options = ExponentialRetry(statuses={405})  # method not allowed
+    retry_options = ExponentialRetry(start_timeout=0, statuses={405})  # method not allowed
     retry_client, _ = await get_retry_client_and_test_app_for_test(aiohttp_client, retry_options=retry_options)
     async with retry_client.requests(
         params_list=[
@@ -449,7 +461,7 @@ async def test_multiply_methods_by_requests(aiohttp_client: pytest_aiohttp.plugi
 
 
 async def test_change_headers(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
-    retry_options = ExponentialRetry(statuses={406})
+    retry_options = ExponentialRetry(start_timeout=0, statuses={406})
     retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client, retry_options=retry_options)
     async with retry_client.requests(
         params_list=[
@@ -502,7 +514,7 @@ async def test_list_retry_all_failed(aiohttp_client: pytest_aiohttp.plugin.Aioht
     async def evaluate_response(response: ClientResponse) -> bool:
         return False
 
-    retry_options = ListRetry(timeouts=[1] * 3, statuses={403}, evaluate_response_callback=evaluate_response)
+    retry_options = ListRetry(timeouts=[0] * 3, statuses={403}, evaluate_response_callback=evaluate_response)
     retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
 
     async with retry_client.get("/with_auth", retry_options=retry_options) as response:
@@ -510,3 +522,153 @@ async def test_list_retry_all_failed(aiohttp_client: pytest_aiohttp.plugin.Aioht
         assert test_app.counter == 3
 
     await retry_client.close()
+
+
+@pytest.mark.parametrize("raise_for_status", [False, True])
+async def test_no_sleep_after_last_attempt(
+    aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
+    sleeps: list[float],
+    raise_for_status: bool,
+) -> None:
+    retry_options = ExponentialRetry(attempts=3, exceptions={ClientResponseError})
+    retry_client, test_app = await get_retry_client_and_test_app_for_test(
+        aiohttp_client,
+        raise_for_status=raise_for_status,
+        retry_options=retry_options,
+    )
+
+    if raise_for_status:
+        with pytest.raises(ClientResponseError):
+            await retry_client.get("/internal_error")
+    else:
+        async with retry_client.get("/internal_error") as response:
+            assert response.status == 500
+
+    assert test_app.counter == 3
+    assert sleeps == [retry_options.get_timeout(1), retry_options.get_timeout(2)]
+
+    await retry_client.close()
+
+
+@pytest.mark.parametrize(("max_retry_after", "expected_sleep"), [(None, 0.2), (3.0, 3.0), (10.0, 5.0)])
+async def test_retry_after(
+    aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
+    sleeps: list[float],
+    max_retry_after: float | None,
+    expected_sleep: float,
+) -> None:
+    retry_options = ExponentialRetry(statuses={429}, max_retry_after=max_retry_after)
+    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client, retry_options=retry_options)
+    async with retry_client.get("/retry_after") as response:
+        assert response.status == 200
+        assert test_app.counter == 2
+
+    assert sleeps == [expected_sleep]
+
+    await retry_client.close()
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("120", 120.0),
+        (" 7 ", 7.0),
+        ("-1", None),
+        ("soon", None),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ],
+)
+def test_parse_retry_after(value: str | None, expected: float | None) -> None:
+    assert _parse_retry_after(value) == expected
+
+
+async def test_no_sleep_for_zero_timeout(
+    aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
+    sleeps: list[float],
+) -> None:
+    retry_options = ListRetry(timeouts=[0] * 3)
+    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client, retry_options=retry_options)
+
+    async with retry_client.get("/internal_error") as response:
+        assert response.status == 500
+        assert test_app.counter == 3
+
+    assert sleeps == []
+
+    await retry_client.close()
+
+
+async def test_circuit_breaker(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
+    test_app = App()
+    client = await aiohttp_client(test_app.web_app())
+    retry_client = RetryClient(
+        client_session=client,
+        retry_options=ListRetry(timeouts=[0] * 2),
+        circuit_breaker=CircuitBreaker(failure_threshold=2),
+    )
+
+    for _ in range(2):
+        async with retry_client.get("/internal_error") as response:
+            assert response.status == 500
+    assert test_app.counter == 4
+
+    with pytest.raises(CircuitOpenError):
+        await retry_client.get("/ping")
+    assert test_app.counter == 4
+
+    await retry_client.close()
+
+
+@pytest.mark.parametrize("raise_for_status", [False, True])
+async def test_circuit_breaker_ignores_client_errors(
+    aiohttp_client: pytest_aiohttp.plugin.AiohttpClient,
+    raise_for_status: bool,
+) -> None:
+    async def evaluate_response(response: ClientResponse) -> bool:
+        raise ValueError
+
+    test_app = App()
+    client = await aiohttp_client(test_app.web_app())
+    circuit_breaker = CircuitBreaker(failure_threshold=2)
+    retry_client = RetryClient(
+        client_session=client,
+        retry_options=ListRetry(timeouts=[0] * 2),
+        raise_for_status=raise_for_status,
+        circuit_breaker=circuit_breaker,
+    )
+
+    for _ in range(2):
+        with pytest.raises(ClientResponseError) if raise_for_status else contextlib.nullcontext():
+            async with retry_client.get("/not_found_error") as response:
+                assert response.status == 404
+    assert not circuit_breaker.is_open
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await retry_client.get("/ping", ListRetry(timeouts=[0] * 2, evaluate_response_callback=evaluate_response))
+    assert not circuit_breaker.is_open
+
+    async with retry_client.get("/ping") as response:
+        assert response.status == 200
+    assert test_app.counter == 5
+
+    await retry_client.close()
+
+
+async def test_client_session_can_be_replaced(aiohttp_client: pytest_aiohttp.plugin.AiohttpClient) -> None:
+    retry_client, test_app = await get_retry_client_and_test_app_for_test(aiohttp_client)
+    new_test_app = App()
+    retry_client._client = await aiohttp_client(new_test_app.web_app())
+
+    async with retry_client.get("/ping") as response:
+        assert response.status == 200
+
+    assert test_app.counter == 0
+    assert new_test_app.counter == 1
+    await retry_client.close()
+
+
+def test_type_hints_resolve_at_runtime() -> None:
+    hints = get_type_hints(RetryClient.__init__)
+    assert hints["circuit_breaker"] == Optional[CircuitBreaker]
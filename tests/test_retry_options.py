@@ -1,4 +1,7 @@
 import random
+import warnings
+
+import pytest
 
 from aiohttp_retry import (
     ExponentialRetry,
@@ -6,6 +9,7 @@ from aiohttp_retry import (
     JitterRetry,
     ListRetry,
     RandomRetry,
+    RetryOptions,
 )
 
 
@@ -15,6 +19,53 @@ def test_exponential_retry() -> None:
     assert timeouts == [0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 6.4, 12.8, 25.6, 30.0]
 
 
+def test_exponential_retry_after_attempts_change() -> None:
+    retry = ExponentialRetry(attempts=2)
+    retry.attempts = 10
+    timeouts = [retry.get_timeout(x) for x in range(10)]
+    assert timeouts == [0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 6.4, 12.8, 25.6, 30.0]
+
+    # far past max_timeout, where the power itself overflows a float
+    retry.attempts = 2000
+    assert retry.get_timeout(2000) == 30.0
+
+
+@pytest.mark.parametrize("factor", [2.0, 10.0])
+def test_exponential_retry_with_many_attempts(factor: float) -> None:
+    retry = ExponentialRetry(attempts=1100, factor=factor)
+    assert retry.get_timeout(1) == 0.1 * factor
+    assert retry.get_timeout(400) == 30.0
+    assert retry.get_timeout(1100) == 30.0
+
+
+def test_exponential_retry_table_size_is_bounded() -> None:
+    retry = ExponentialRetry(attempts=10**6, start_timeout=1.0, factor=1.0)
+    assert len(retry._timeouts) == 64
+    assert retry.get_timeout(10**6) == 1.0
+
+
+@pytest.mark.parametrize("factor", [2.0, 3.0])
+def test_exponential_retry_with_zero_start_timeout(factor: float) -> None:
+    retry = ExponentialRetry(start_timeout=0, factor=factor)
+    assert [retry.get_timeout(1), retry.get_timeout(1000)] == [0.0, 0.0]
+
+
+def test_exponential_retry_with_tiny_start_timeout() -> None:
+    retry = ExponentialRetry(attempts=5000, start_timeout=1e-320)
+    assert retry.get_timeout(1) == 2e-320
+    assert retry.get_timeout(5000) == 30.0
+
+
+def test_exponential_retry_with_full_jitter() -> None:
+    retry = ExponentialRetry(attempts=10, full_jitter=True, random_func=random.Random(0).random)
+    timeouts = [retry.get_timeout(x) for x in range(10)]
+    assert [round(timeout, 2) for timeout in timeouts] == [0.08, 0.15, 0.17, 0.21, 0.82, 1.3, 5.02, 3.88, 12.2, 17.5]
+
+    caps = [0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 6.4, 12.8, 25.6, 30.0]
+    for timeout, cap in zip(timeouts, caps):
+        assert 0 <= timeout <= cap
+
+
 def test_random_retry() -> None:
     retry = RandomRetry(attempts=10, random_func=random.Random(0).random)
     timeouts = [round(retry.get_timeout(x), 2) for x in range(10)]
@@ -28,15 +79,40 @@ def test_list_retry() -> None:
     assert timeouts == expected
 
 
+def test_list_retry_after_attempts_change() -> None:
+    retry = ListRetry([1.0, 2.0])
+    retry.attempts = 4
+    timeouts = [retry.get_timeout(x) for x in range(4)]
+    assert timeouts == [1.0, 2.0, 2.0, 2.0]
+
+
 def test_fibonacci_retry() -> None:
     retry = FibonacciRetry(attempts=10, multiplier=2, max_timeout=60)
-    timeouts = [retry.get_timeout(x) for x in range(10)]
+    timeouts = [retry.get_timeout(x) for x in range(1, 11)]
     assert timeouts == [4.0, 6.0, 10.0, 16.0, 26.0, 42.0, 60, 60, 60, 60]
 
 
+def test_fibonacci_retry_first_timeout() -> None:
+    # requests start with attempt 1, the first retry waits multiplier * 2 as it always did
+    retry = FibonacciRetry(multiplier=1, max_timeout=3)
+    assert [retry.get_timeout(1), retry.get_timeout(2)] == [2.0, 3.0]
+
+
+def test_fibonacci_retry_is_stateless() -> None:
+    retry = FibonacciRetry(attempts=3, multiplier=2, max_timeout=60)
+    assert [retry.get_timeout(1), retry.get_timeout(1)] == [4.0, 4.0]
+    assert retry.get_timeout(5) == 26.0
+
+
+def test_fibonacci_retry_after_options_change() -> None:
+    retry = FibonacciRetry(multiplier=1, max_timeout=3)
+    retry.max_timeout = 100
+    retry.multiplier = 10
+    assert [retry.get_timeout(x) for x in range(1, 4)] == [20.0, 30.0, 50.0]
+
+
 def test_jitter_retry() -> None:
-    random.seed(10)
-    retry = JitterRetry(attempts=10)
+    retry = JitterRetry(attempts=10, random_func=random.Random(10).random)
     timeouts = [retry.get_timeout(x) for x in range(10)]
     assert len(timeouts) == 10
 
@@ -54,3 +130,27 @@ def test_jitter_retry() -> None:
     ]
     for idx, timeout in enumerate(timeouts):
         assert abs(timeout - expected[idx]) < 0.1
+
+
+def test_options_are_normalized() -> None:
+    retry = ExponentialRetry(statuses=[404, 404, 429], exceptions=[ValueError, KeyError], methods=["get", "Post"])
+    assert retry.statuses == frozenset({404, 429})
+    assert retry.exceptions == (ValueError, KeyError)
+    assert retry.methods == frozenset({"GET", "POST"})
+
+
+def test_retry_options_warns_once() -> None:
+    with pytest.warns(DeprecationWarning, match="deprecated"):
+        assert isinstance(RetryOptions(), ExponentialRetry)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("default")
+        for _ in range(3):
+            RetryOptions()
+    assert len(caught) == 1
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        for _ in range(3):
+            RetryOptions()
+    assert len(caught) == 3